@@ -14,6 +14,7 @@ if TYPE_CHECKING:
 
 
 TOKEN_DICT = dict[POS, list[str]]
+PENDING_LIST = tuple[list, list, int, bool]
 
 
 class Capture:
@@ -23,16 +24,27 @@ class Capture:
     The Capture object stores this subsequent parse to be dispatched at a later moment.
     """
 
+    __slots__ = (
+        "handler",
+        "pattern",
+        "matching",
+        "parsers",
+        "starting",
+        "boundary",
+        "key",
+        "depth",
+    )
+
     def __init__(
         self,
         handler: ContentHandler,
         pattern: Pattern,
         matching: Match,
-        parsers: dict[int, GrammarParser],
+        parsers: list[GrammarParser | None],
         starting: tuple[int, int],
         boundary: tuple[int, int],
         key: str = "",
-        **kwargs,
+        depth: int = -1,
     ):
         """
         Initialize a new instance of the Element class.
@@ -40,11 +52,11 @@ class Capture:
         :param handler: The content handler for the element.
         :param pattern: The pattern used for matching.
         :param matching: The match object.
-        :param parsers: A dictionary of grammar parsers.
+        :param parsers: A list of grammar parsers, indexed by capture group id.
         :param starting: The starting position of the element.
         :param boundary: The boundary position of the element.
         :param key: The key for the element. Defaults to "".
-        :param **kwargs: Additional keyword arguments.
+        :param depth: The depth of the parser that matched the pattern.
         :returns: None
         """
         self.handler = handler
@@ -54,7 +66,7 @@ class Capture:
         self.starting = starting
         self.boundary = boundary
         self.key = key
-        self.kwargs = kwargs
+        self.depth = depth
 
     def __eq__(self, other: object) -> bool:
         if isinstance(other, Capture):
@@ -78,8 +90,11 @@ class Capture:
         :return: A list of Capture or ContentElement objects representing the parsed elements.
         """
         elements = []
-        for group_id, parser in self.parsers.items():
-            if group_id > self.pattern.number_of_captures():
+        number_of_captures = self.pattern.number_of_captures()
+        for group_id, parser in enumerate(self.parsers):
+            if parser is None:
+                continue
+            if group_id > number_of_captures:
                 LOGGER.warning(
                     f"The capture group {group_id} does not exist in pattern {self.pattern._pattern}"
                 )
@@ -103,14 +118,13 @@ class Capture:
                 continue
 
             # Dispatch the parse
-            self.kwargs.pop("greedy", None)
             parsed, captured_elements, _ = parser._parse(
                 self.handler,
                 starting=group_starting,
                 boundary=group_boundary,
-                find_one=self.kwargs.pop("find_one", False),
+                find_one=False,
                 parent_capture=self,
-                **self.kwargs,
+                depth=self.depth,
             )
 
             if parsed:
@@ -143,6 +157,16 @@ def _str_to_list(input: str | list[str]) -> list[str]:
 class ContentElement:
     """The parsed grammar element."""
 
+    __slots__ = (
+        "token",
+        "grammar",
+        "content",
+        "characters",
+        "_children_captures",
+        "_children",
+        "_dispatched",
+    )
+
     def __init__(
         self,
         token: str,
@@ -190,23 +214,45 @@ class ContentElement:
         """
         Dispatches the content element and its children.
 
+        The nested dispatch walks the element tree with an explicit stack of dispatch generators
+        instead of recursion, such that deeply nested elements do not grow the call stack.
+
         :param nested: Indicates whether the dispatch is nested within another dispatch.
         :type nested: bool
         :return: None
         """
+        if not nested:
+            for _ in self._iter_dispatch():
+                pass
+            return
+
+        stack = [self._iter_dispatch()]
+        while stack:
+            element = next(stack[-1], None)
+            if element is None:
+                stack.pop()
+            else:
+                stack.append(element._iter_dispatch())
+
+    def _iter_dispatch(self) -> Generator[ContentElement, None, None]:
+        """Dispatches the captures of the element and yields the dispatched subelements in order."""
         if self._dispatched:
             return
         self._dispatched = True
         self._children: list[ContentElement] = _dispatch_list(self._children_captures, parent=self)
         self._children_captures = []
-        if nested:
-            for child in self._children:
-                child._dispatch(True)
+        yield from self._children
 
     def __eq__(self, other):
+        if self is other:
+            return True
         if not isinstance(other, ContentElement):
             return False
-        return bool(self.grammar == other.grammar and self.characters == other.characters)
+        # Elements of the same parser share its grammar, such that the identity check avoids a deep comparison
+        return bool(
+            (self.grammar is other.grammar or self.grammar == other.grammar)
+            and self.characters == other.characters
+        )
 
     def _find(
         self,
@@ -342,16 +388,58 @@ class ContentElement:
 
         :return: The converted dictionary representation of the object.
         """
-        out_dict = {"token": self.token}
+        out_dict, pending = self._dict_fields(depth=depth, all_content=all_content)
+
+        # Fill the subelement lists with an explicit stack instead of recursing per element
+        while pending:
+            items, elements, item_depth, item_all_content = pending.pop()
+            for element in elements:
+                if isinstance(element, ContentElement):
+                    element_dict, element_pending = element._dict_fields(
+                        depth=item_depth, all_content=item_all_content
+                    )
+                    pending.extend(element_pending)
+                    items.append(element_dict)
+                else:
+                    items.append(element)
+        return out_dict
+
+    def _dict_fields(self, depth: int, all_content: bool) -> tuple[dict, list[PENDING_LIST]]:
+        """Makes the dictionary of the element without converting its subelements.
+
+        :param depth: The depth of the conversion.
+        :param all_content: Whether to include all content or only the top-level content.
+        :return: The dictionary of the element and, for each subelement list to be converted, the empty
+            output list, the subelements, and the depth and all_content arguments of their conversion.
+        """
+        out_dict: dict = {"token": self.token}
+        pending: list[PENDING_LIST] = []
         if all_content or not self.children:
             out_dict["content"] = self.content
-        if self.children:
-            out_dict["children"] = (
-                self._list_property_to_dict("children", depth=depth - 1, all_content=all_content)
-                if depth
-                else self.children
-            )
-        return out_dict
+        self._add_dict_field(out_dict, pending, "children", self.children, depth, all_content)
+        return out_dict, pending
+
+    @staticmethod
+    def _add_dict_field(
+        out_dict: dict,
+        pending: list[PENDING_LIST],
+        key: str,
+        elements: list[ContentElement],
+        depth: int,
+        all_content: bool,
+    ) -> None:
+        """Adds a list of subelements to the dictionary of an element, if there are any.
+
+        The subelements are kept as is when the maximum depth is reached. Otherwise an empty list is added,
+        which is registered in pending to be filled with the dictionaries of the subelements.
+        """
+        if not elements:
+            return
+        if depth:
+            out_dict[key] = []
+            pending.append((out_dict[key], elements, depth - 1, all_content))
+        else:
+            out_dict[key] = elements
 
     def flatten(self) -> list[tuple[tuple[int, int], str, list[str]]]:
         """
@@ -427,13 +515,6 @@ class ContentElement:
             element._token_by_index(token_dict)
         return token_dict
 
-    def _list_property_to_dict(self, prop: str, **kwargs):
-        """Makes a dictionary from a property."""
-        return [
-            item.to_dict(**kwargs) if isinstance(item, ContentElement) else item
-            for item in getattr(self, prop, [])
-        ]
-
     def __repr__(self) -> str:
         content = self.content if len(self.content) < 15 else self.content[:15] + "..."
         return repr(f"{self.token}<<{content}>>({len(self.children)})")
@@ -442,6 +523,8 @@ class ContentElement:
 class ContentBlockElement(ContentElement):
     """A parsed element with a begin and a end"""
 
+    __slots__ = ("_begin_captures", "_end_captures", "_begin", "_end")
+
     def __init__(
         self,
         *args,
@@ -496,46 +579,32 @@ class ContentBlockElement(ContentElement):
             self._dispatch()
         return self._end
 
-    def _dispatch(self, nested: bool = False):
+    def _iter_dispatch(self) -> Generator[ContentElement, None, None]:
         if self._dispatched:
             return
-        super()._dispatch(nested)
+        yield from super()._iter_dispatch()
         self._begin: list[ContentElement] = _dispatch_list(self._begin_captures, parent=self)
         self._end: list[ContentElement] = _dispatch_list(self._end_captures, parent=self)
         self._begin_captures, self._end_captures = [], []
-        if nested:
-            for item in self._begin:
-                item._dispatch(True)
-            for item in self._end:
-                item._dispatch(True)
+        yield from self._begin
+        yield from self._end
 
-    def to_dict(self, depth: int = -1, all_content: bool = False, **kwargs) -> dict:
-        """
-        Converts the element to a dictionary representation.
-
-        :param depth: The depth of the conversion. Defaults to -1.
-        :param all_content: Whether to include all content. Defaults to False.
-        :param **kwargs: Additional keyword arguments.
+    def _dict_fields(self, depth: int, all_content: bool) -> tuple[dict, list[PENDING_LIST]]:
+        """Makes the dictionary of the element without converting its subelements.
 
-        :return: The dictionary representation of the element.
+        :param depth: The depth of the conversion.
+        :param all_content: Whether to include all content.
+        :return: The dictionary of the element and the subelement lists to be converted.
         """
-        out_dict = super().to_dict(depth=depth, all_content=all_content, **kwargs)
-        if self.begin:
-            out_dict["begin"] = (
-                self._list_property_to_dict("begin", depth=depth - 1, **kwargs)
-                if depth
-                else self.begin
-            )
-        if self.end:
-            out_dict["end"] = (
-                self._list_property_to_dict("end", depth=depth - 1, **kwargs) if depth else self.end
-            )
-
-        ordered_keys = [
-            key for key in ["token", "begin", "end", "content", "children"] if key in out_dict
-        ]
-        ordered_dict = {key: out_dict[key] for key in ordered_keys}
-        return ordered_dict
+        # The dictionary is built in order of token, begin, end, content and children
+        out_dict: dict = {"token": self.token}
+        pending: list[PENDING_LIST] = []
+        self._add_dict_field(out_dict, pending, "begin", self.begin, depth, False)
+        self._add_dict_field(out_dict, pending, "end", self.end, depth, False)
+        if all_content or not self.children:
+            out_dict["content"] = self.content
+        self._add_dict_field(out_dict, pending, "children", self.children, depth, all_content)
+        return out_dict, pending
 
     def _token_by_index(self, token_dict: TOKEN_DICT | None = None) -> TOKEN_DICT:
         """Converts the object to a flattened array of tokens."""
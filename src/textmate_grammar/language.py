@@ -1,3 +1,4 @@
+import sys
 from pathlib import Path
 
 from .elements import Capture, ContentElement
@@ -16,6 +17,9 @@ class DummyParser(GrammarParser):
     def __init__(self):
         self.key = "DummyLanguage"
         self.initialized = True
+        self.disabled = False
+        self.anchored = False
+        self.first_chars = None
 
     def _initialize_repository(self):
         pass
@@ -47,7 +51,7 @@ class LanguageParser(PatternsParser):
         self.name = grammar.get("name", "")
         self.uuid = grammar.get("uuid", "")
         self.file_types = grammar.get("fileTypes", [])
-        self.token = grammar.get("scopeName", "myScope")
+        self.token = sys.intern(grammar.get("scopeName", "myScope"))
         self.repository = {}
         self.injections: list[dict] = []
         self._cache: TextmateCache = init_cache()
@@ -154,10 +158,25 @@ class LanguageParser(PatternsParser):
         return element  # type: ignore
 
     def _parse(
-        self, handler: ContentHandler, starting: POS, **kwargs
-    ) -> tuple[bool, list[Capture | ContentElement], tuple[int, int]]:
-        kwargs.pop("find_one", None)
-        return super()._parse(handler, starting, find_one=False, **kwargs)
+        self,
+        handler: ContentHandler,
+        starting: POS,
+        boundary: POS | None = None,
+        greedy: bool = False,
+        find_one: bool = True,
+        parent_capture: Capture | None = None,
+        depth: int = -1,
+        **kwargs,
+    ) -> tuple[bool, list[Capture | ContentElement], tuple[POS, POS]]:
+        return super()._parse(
+            handler,
+            starting,
+            boundary=boundary,
+            greedy=greedy,
+            find_one=False,
+            parent_capture=parent_capture,
+            depth=depth,
+        )
 
 
 def _gen_repositories(grammar, key="repository"):
@@ -1,19 +1,56 @@
 from __future__ import annotations
 
+import sys
 from abc import ABC, abstractmethod
+from functools import lru_cache
 from typing import TYPE_CHECKING
 
 import onigurumacffi as re
 
 from .elements import Capture, ContentBlockElement, ContentElement
 from .utils.exceptions import IncludedParserNotFound
-from .utils.handler import POS, ContentHandler, Pattern
-from .utils.logger import LOGGER, track_depth
+from .utils.handler import POS, ContentHandler, Match, Pattern
+from .utils.logger import LOGGER
+from .utils.regex import pattern_first_chars
 
 if TYPE_CHECKING:
     from .language import LanguageParser
 
 
+@lru_cache(maxsize=None)
+def _compile(pattern: str) -> Pattern:
+    """Compiles a regex pattern, reusing the compiled object for identical sources."""
+    return re.compile(pattern)
+
+
+def _candidate_patterns(
+    handler: ContentHandler, position: POS, patterns: list, by_char: dict[str, list]
+) -> list:
+    """Returns the patterns that can match at a position without skipping any leading characters.
+
+    If the character at the position is a non-whitespace ASCII character, a match must start with it, such that
+    only patterns with unknown first characters or of which the first characters include it are kept. The
+    selection is stored per character in by_char.
+
+    :param handler: The content handler.
+    :param position: The position to match at.
+    :param patterns: The patterns to select from.
+    :param by_char: The selected patterns per character.
+    :return: The patterns that can match at the position.
+    """
+    line = handler.lines[position[0]] if position[0] < len(handler.lines) else ""
+    char = line[position[1] : position[1] + 1]
+    if not char or char > "\x7f" or char.isspace():
+        return patterns
+    if char not in by_char:
+        by_char[char] = [
+            parser
+            for parser in patterns
+            if (first_chars := parser.first_set()) is None or char in first_chars
+        ]
+    return by_char[char]
+
+
 class GrammarParser(ABC):
     """The abstract grammar parser object"""
 
@@ -61,7 +98,9 @@ class GrammarParser(ABC):
         self.grammar = grammar
         self.language = language
         self.key = key
-        self.token = grammar.get("name", "")
+        self.token = sys.intern(grammar.get("name", ""))
+        self.disabled: bool = grammar.get("disabled", False)
+        self.first_chars: frozenset[str] | None = None
         self.is_capture = is_capture
         self.initialized = False
         self.anchored = False
@@ -70,21 +109,17 @@ class GrammarParser(ABC):
     def comment(self) -> str:
         return self.grammar.get("comment", "")
 
-    @property
-    def disabled(self) -> bool:
-        return self.grammar.get("disabled", False)
-
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}:<{self.key}>"
 
-    def _init_captures(self, grammar: dict, key: str = "captures", **kwargs) -> dict:
-        """Initializes a captures dictionary"""
-        captures = {}
-        if key in grammar:
-            for group_id, pattern in grammar[key].items():
-                captures[int(group_id)] = self.initialize(
-                    pattern, language=self.language, is_capture=True
-                )
+    def _init_captures(self, grammar: dict, key: str = "captures", **kwargs) -> list:
+        """Initializes a captures list, indexed by capture group id"""
+        if not grammar.get(key):
+            return []
+        group_ids = [int(group_id) for group_id in grammar[key]]
+        captures: list = [None] * (max(group_ids) + 1)
+        for group_id, pattern in zip(group_ids, grammar[key].values()):
+            captures[group_id] = self.initialize(pattern, language=self.language, is_capture=True)
         return captures
 
     def _find_include(self, key: str, **kwargs) -> GrammarParser:
@@ -104,8 +139,9 @@ class GrammarParser(ABC):
         self,
         handler: ContentHandler,
         starting: POS,
+        *args,
         **kwargs,
-    ) -> tuple[bool, list[Capture | ContentElement], tuple[int, int] | None]:
+    ) -> tuple[bool, list[Capture | ContentElement], tuple[POS, POS] | None]:
         """The abstract method which all parsers much implement
 
         The ``_parse`` method is called by ``parse``, which will additionally parse any nested Capture elements.
@@ -113,11 +149,19 @@ class GrammarParser(ABC):
 
         :param handler: The content handler to handle the parsed elements.
         :param starting: The starting position of the parsing.
-        :param kwargs: Additional keyword arguments.
+        :param args: Additional positional arguments, such as the boundary position.
+        :param kwargs: Additional keyword arguments, being ``greedy``, ``find_one``, ``parent_capture`` and ``depth``.
         :return: A tuple containing the parsing result, a list of parsed elements, and the ending position of the parsing.
         """
         pass
 
+    def first_set(self) -> frozenset[str] | None:
+        """Returns the ASCII characters that an element found by the parser can start with.
+
+        :return: The set of characters, or None if they cannot be determined.
+        """
+        return self.first_chars
+
     def _initialize_repository(self, **kwargs) -> None:
         """Initializes the repository's inclusions.
 
@@ -132,7 +176,7 @@ class GrammarParser(ABC):
         starting: POS = (0, 0),
         boundary: POS | None = None,
         **kwargs,
-    ) -> tuple[bool, list[Capture | ContentElement], tuple[int, int] | None]:
+    ) -> tuple[bool, list[Capture | ContentElement], tuple[POS, POS] | None]:
         """
         The method to parse a handler using the current grammar.
 
@@ -157,10 +201,11 @@ class GrammarParser(ABC):
         pattern: Pattern,
         starting: POS,
         boundary: POS,
-        parsers: dict[int, GrammarParser] | None = None,
+        parsers: list[GrammarParser | None] | None = None,
         parent_capture: Capture | None = None,
-        **kwargs,
-    ) -> tuple[tuple[POS, POS] | None, str, list[Capture | ContentElement]]:
+        greedy: bool = False,
+        depth: int = 0,
+    ) -> tuple[tuple[POS, POS] | None, Match | None, list[Capture | ContentElement]]:
         """Matches a pattern and its capture groups.
 
         Matches the pattern on the handler between the starting and boundary positions. If a pattern is matched,
@@ -171,14 +216,16 @@ class GrammarParser(ABC):
         :param pattern: The pattern to match.
         :param starting: The starting position for the match.
         :param boundary: The boundary position for the match.
-        :param parsers: A dictionary of parsers.
+        :param parsers: A list of parsers, indexed by capture group id.
         :param parent_capture: The parent capture object.
-        :param kwargs: Additional keyword arguments.
-        :return: A tuple containing the span of the match, the matched string, and a list of capture objects or content elements.
+        :param greedy: Whether any leading characters may be skipped by the match.
+        :param depth: The depth of the calling parser.
+        :return: A tuple containing the span of the match, the match object, and a list of capture objects or content elements.
+            The matched string is not extracted, as most callers only need the span.
         """
         if parsers is None:
-            parsers = {}
-        matching, span = handler.search(pattern, starting=starting, boundary=boundary, **kwargs)
+            parsers = []
+        matching, span = handler.search(pattern, starting, boundary, greedy, depth)
 
         if matching:
             if parsers:
@@ -190,16 +237,16 @@ class GrammarParser(ABC):
                     starting,
                     boundary,
                     key=self.key,
-                    **kwargs,
+                    depth=depth,
                 )
                 if parent_capture is not None and capture == parent_capture:
-                    return None, "", []
+                    return None, None, []
                 else:
-                    return span, matching.group(), [capture]
+                    return span, matching, [capture]
             else:
-                return span, matching.group(), []
+                return span, matching, []
         else:
-            return None, "", []
+            return None, None, []
 
 
 class TokenParser(GrammarParser):
@@ -212,25 +259,32 @@ class TokenParser(GrammarParser):
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}:{self.token}"
 
-    @track_depth
     def _parse(
         self,
         handler: ContentHandler,
         starting: POS,
         boundary: POS,
-        **kwargs,
+        greedy: bool = False,
+        find_one: bool = True,
+        parent_capture: Capture | None = None,
+        depth: int = -1,
     ) -> tuple[bool, list[Capture | ContentElement], tuple[POS, POS] | None]:
         """The parse method for grammars for which only the token is provided.
 
         When no regex patterns are provided. The element is created between the initial and boundary positions.
         """
-        content = handler.read_pos(starting, boundary)
+        depth += 1
+        if starting == boundary:
+            content, characters = "", {}
+        else:
+            content = handler.read_pos(starting, boundary)
+            characters = handler.chars(starting, boundary)
         elements: list[Capture | ContentElement] = [
             ContentElement(
                 token=self.token,
                 grammar=self.grammar,
                 content=content,
-                characters=handler.chars(starting, boundary),
+                characters=characters,
             )
         ]
         handler.anchor = boundary[1]
@@ -238,7 +292,7 @@ class TokenParser(GrammarParser):
             f"{self.__class__.__name__} found < {repr(content)} >",
             self,
             starting,
-            kwargs.get("depth", 0),
+            depth,
         )
         return True, elements, (starting, boundary)
 
@@ -248,7 +302,8 @@ class MatchParser(GrammarParser):
 
     def __init__(self, grammar: dict, **kwargs) -> None:
         super().__init__(grammar, **kwargs)
-        self.exp_match = re.compile(grammar["match"])
+        self.exp_match = _compile(grammar["match"])
+        self.first_chars = pattern_first_chars(grammar["match"])
         self.parsers = self._init_captures(grammar, key="captures")
         if "\\G" in grammar["match"]:
             self.anchored = True
@@ -263,46 +318,60 @@ class MatchParser(GrammarParser):
     def _initialize_repository(self, **kwargs) -> None:
         """When the grammar has patterns, this method should called to initialize its inclusions."""
         self.initialized = True
-        for key, value in self.parsers.items():
-            if not isinstance(value, GrammarParser):
+        for key, value in enumerate(self.parsers):
+            if value is not None and not isinstance(value, GrammarParser):
                 self.parsers[key] = self._find_include(value)
-        for parser in self.parsers.values():
-            if not parser.initialized:
+        for parser in self.parsers:
+            if parser is not None and not parser.initialized:
                 parser._initialize_repository()
 
-    @track_depth
     def _parse(
         self,
         handler: ContentHandler,
         starting: POS,
         boundary: POS,
-        **kwargs,
+        greedy: bool = False,
+        find_one: bool = True,
+        parent_capture: Capture | None = None,
+        depth: int = -1,
     ) -> tuple[bool, list[Capture | ContentElement], tuple[POS, POS] | None]:
         """The parse method for grammars for which a match pattern is provided."""
+        depth += 1
 
-        span, content, captures = self.match_and_capture(
-            handler,
-            pattern=self.exp_match,
-            starting=starting,
-            boundary=boundary,
-            parsers=self.parsers,
-            **kwargs,
-        )
+        # The search and capture of match_and_capture, inlined as this is the most frequent parse
+        matching, span = handler.search(self.exp_match, starting, boundary, greedy, depth)
+        captures: list[Capture | ContentElement] = []
+        if matching and self.parsers:
+            capture = Capture(
+                handler,
+                self.exp_match,
+                matching,
+                self.parsers,
+                starting,
+                boundary,
+                key=self.key,
+                depth=depth,
+            )
+            if parent_capture is not None and capture == parent_capture:
+                span = None
+            else:
+                captures.append(capture)
 
-        if span is None:
+        if matching is None or span is None:
             LOGGER.debug(
                 f"{self.__class__.__name__} no match",
                 self,
                 starting,
-                kwargs.get("depth", 0),
+                depth,
             )
             return False, [], None
 
+        content = matching.group()
         LOGGER.info(
             f"{self.__class__.__name__} found < {repr(content)} >",
             self,
             starting,
-            kwargs.get("depth", 0),
+            depth,
         )
 
         if self.token:
@@ -328,6 +397,10 @@ class ParserHasPatterns(GrammarParser, ABC):
             self.initialize(pattern, language=self.language)
             for pattern in grammar.get("patterns", [])
         ]
+        self._active_patterns: list = []
+        self._non_anchored_patterns: list = []
+        self._active_patterns_by_char: dict[str, list] = {}
+        self._non_anchored_patterns_by_char: dict[str, list] = {}
 
     def _initialize_repository(self):
         """When the grammar has patterns, this method should called to initialize its inclusions."""
@@ -341,10 +414,13 @@ class ParserHasPatterns(GrammarParser, ABC):
                 parser._initialize_repository()
 
         # Copy patterns from included pattern parsers
-        pattern_parsers = [parser for parser in self.patterns if isinstance(parser, PatternsParser)]
-        for parser in pattern_parsers:
-            parser_index = self.patterns.index(parser)
-            self.patterns[parser_index : parser_index + 1] = parser.patterns
+        patterns = []
+        for parser in self.patterns:
+            if isinstance(parser, PatternsParser):
+                patterns.extend(parser.patterns)
+            else:
+                patterns.append(parser)
+        self.patterns = patterns
 
         # Injection grammars
         for exception_scopes, injection_pattern in self.language.injections:
@@ -354,11 +430,42 @@ class ParserHasPatterns(GrammarParser, ABC):
             elif self.is_capture:
                 self.patterns.append(injection_pattern)
 
+        # The patterns to parse with, which are fixed once the inclusions are initialized
+        self._active_patterns = [parser for parser in self.patterns if not parser.disabled]
+        self._non_anchored_patterns = [
+            parser for parser in self._active_patterns if not parser.anchored
+        ]
+        self._active_patterns_by_char = {}
+        self._non_anchored_patterns_by_char = {}
+
 
 class PatternsParser(ParserHasPatterns):
     """The parser for grammars for which several patterns are provided."""
 
-    @track_depth
+    def __init__(self, grammar: dict, **kwargs) -> None:
+        super().__init__(grammar, **kwargs)
+        self._first_set_resolved = False
+
+    def first_set(self) -> frozenset[str] | None:
+        """Returns the ASCII characters that an element found by the parser can start with.
+
+        A single element is found by the first pattern that matches, such that these are the union of the first
+        characters of the patterns. A parser with a token always finds an element, even if no pattern matches.
+        """
+        if not self._first_set_resolved and self.initialized:
+            # Resolved as unknown beforehand, such that recursive inclusions remain conservative
+            self._first_set_resolved = True
+            if not self.token:
+                first_chars: frozenset[str] = frozenset()
+                for parser in self._active_patterns:
+                    parser_chars = parser.first_set()
+                    if parser_chars is None:
+                        break
+                    first_chars |= parser_chars
+                else:
+                    self.first_chars = first_chars
+        return self.first_chars
+
     def _parse(
         self,
         handler: ContentHandler,
@@ -366,28 +473,41 @@ class PatternsParser(ParserHasPatterns):
         boundary: POS | None = None,
         greedy: bool = False,
         find_one: bool = True,
-        **kwargs,
+        parent_capture: Capture | None = None,
+        depth: int = -1,
     ) -> tuple[bool, list[Capture | ContentElement], tuple[POS, POS]]:
         """The parse method for grammars for which a match pattern is provided."""
+        depth += 1
 
         if boundary is None:
-            boundary = (len(handler.lines) - 1, handler.line_lengths[-1])
+            boundary = handler.eof
 
         parsed = False
         elements: list[Capture | ContentElement] = []
-        patterns = [parser for parser in self.patterns if not parser.disabled]
+        patterns = self._active_patterns
+        line_lengths = handler.line_lengths
 
         current = (starting[0], starting[1])
 
         while current < boundary:
-            for parser in patterns:
+            round_starting, round_anchor = current, handler.anchor
+            parsed = False
+            if greedy:
+                candidates = patterns
+            else:
+                candidates = _candidate_patterns(
+                    handler, current, patterns, self._active_patterns_by_char
+                )
+
+            for parser in candidates:
                 # Try to find patterns
                 parsed, captures, span = parser._parse(
                     handler,
                     current,
                     boundary=boundary,
                     greedy=greedy,
-                    **kwargs,
+                    parent_capture=parent_capture,
+                    depth=depth,
                 )
                 if parsed:
                     if find_one:
@@ -395,7 +515,7 @@ class PatternsParser(ParserHasPatterns):
                             f"{self.__class__.__name__} found single element",
                             self,
                             current,
-                            kwargs.get("depth", 0),
+                            depth,
                         )
                         return True, captures, span
                     elements.extend(captures)
@@ -407,42 +527,44 @@ class PatternsParser(ParserHasPatterns):
 
             if not parsed and not greedy:
                 # Try again if previously allowed no leading white space charaters, only when multple patterns are to be found
-                options_span, options_elements = {}, {}
+                options_start: list[POS] = []
+                options_span: list[tuple[POS, POS]] = []
+                options_parser: list[GrammarParser] = []
+                options_elements: list[list[Capture | ContentElement]] = []
                 for parser in patterns:
                     parsed, captures, span = parser._parse(
                         handler,
                         current,
                         boundary=boundary,
                         greedy=True,
-                        **kwargs,
+                        parent_capture=parent_capture,
+                        depth=depth,
                     )
                     if parsed:
-                        options_span[parser] = span
-                        options_elements[parser] = captures
+                        options_start.append(span[0])
+                        options_span.append(span)
+                        options_parser.append(parser)
+                        options_elements.append(captures)
                         LOGGER.debug(
                             f"{self.__class__.__name__} found pattern choice",
                             self,
                             current,
-                            kwargs.get("depth", 0),
+                            depth,
                         )
 
-                if options_span:
-                    parser = sorted(
-                        options_span,
-                        key=lambda parser: (
-                            *options_span[parser][0],
-                            patterns.index(parser),
-                        ),
-                    )[0]
-                    current = options_span[parser][1]
-                    elements.extend(options_elements[parser])
+                if options_start:
+                    # The first option with the earliest start, as the options are in order of the patterns
+                    index = options_start.index(min(options_start))
+                    parser = options_parser[index]
+                    current = options_span[index][1]
+                    elements.extend(options_elements[index])
                     LOGGER.info(
                         f"{self.__class__.__name__} chosen pattern of {parser}",
                         self,
                         current,
-                        kwargs.get("depth", 0),
+                        depth,
                     )
-                elif self != self.language:
+                elif self is not self.language:
                     break
                 else:
                     remainder = handler.read_line(current)
@@ -451,7 +573,7 @@ class PatternsParser(ParserHasPatterns):
                             f"{self.__class__.__name__} remainder of line not parsed: {remainder}",
                             self,
                             current,
-                            kwargs.get("depth", 0),
+                            depth,
                         )
                     if current[0] + 1 <= len(handler.lines):
                         current = (current[0] + 1, 0)
@@ -460,7 +582,7 @@ class PatternsParser(ParserHasPatterns):
                             f"{self.__class__.__name__} EOF encountered",
                             self,
                             current,
-                            kwargs.get("depth", 0),
+                            depth,
                         )
                         break
 
@@ -469,19 +591,27 @@ class PatternsParser(ParserHasPatterns):
                     f"{self.__class__.__name__} handler did not move after a search round",
                     self,
                     starting,
-                    kwargs.get("depth", 0),
+                    depth,
                 )
                 break
 
-            line_length = handler.line_lengths[current[0]]
-            if current[1] in [line_length, line_length - 1]:
-                try:
-                    empty_lines = next(
-                        i for i, v in enumerate(handler.line_lengths[current[0] + 1 :]) if v > 1
-                    )
-                    current = (current[0] + 1 + empty_lines, 0)
-                except StopIteration:
+            line_length = line_lengths[current[0]]
+            if line_length - 1 <= current[1] <= line_length:
+                next_line = handler.next_filled_line(current[0])
+                if next_line is None:
                     break
+                current = (next_line, 0)
+
+            if current == round_starting and handler.anchor == round_anchor:
+                # Only empty matches were found and the \G anchor is unchanged, such that every next round would
+                # repeat this one. A moved anchor may let an anchored pattern match in the next round.
+                LOGGER.warning(
+                    f"{self.__class__.__name__} handler did not move after a search round",
+                    self,
+                    current,
+                    depth,
+                )
+                break
 
         if self.token:
             elements = [
@@ -503,14 +633,15 @@ class BeginEndParser(ParserHasPatterns):
     def __init__(self, grammar: dict, **kwargs) -> None:
         super().__init__(grammar, **kwargs)
         if "contentName" in grammar:
-            self.token = grammar["contentName"]
+            self.token = sys.intern(grammar["contentName"])
             self.between_content = True
         else:
-            self.token = grammar.get("name")
+            self.token = sys.intern(grammar.get("name", ""))
             self.between_content = False
         self.apply_end_pattern_last = grammar.get("applyEndPatternLast", False)
-        self.exp_begin = re.compile(grammar["begin"])
-        self.exp_end = re.compile(grammar["end"])
+        self.exp_begin = _compile(grammar["begin"])
+        self.exp_end = _compile(grammar["end"])
+        self.first_chars = pattern_first_chars(grammar["begin"])
         self.parsers_begin = self._init_captures(grammar, key="beginCaptures")
         self.parsers_end = self._init_captures(grammar, key="endCaptures")
         if "\\G" in grammar["begin"]:
@@ -527,64 +658,76 @@ class BeginEndParser(ParserHasPatterns):
         """When the grammar has patterns, this method should called to initialize its inclusions."""
         self.initialized = True
         super()._initialize_repository()
-        for key, value in self.parsers_end.items():
-            if not isinstance(value, GrammarParser):
+        for key, value in enumerate(self.parsers_end):
+            if value is not None and not isinstance(value, GrammarParser):
                 self.parsers_end[key] = self._find_include(value)
-        for key, value in self.parsers_begin.items():
-            if not isinstance(value, GrammarParser):
+        for key, value in enumerate(self.parsers_begin):
+            if value is not None and not isinstance(value, GrammarParser):
                 self.parsers_begin[key] = self._find_include(value)
-        for parser in self.parsers_begin.values():
-            if not parser.initialized:
+        for parser in self.parsers_begin:
+            if parser is not None and not parser.initialized:
                 parser._initialize_repository()
-        for parser in self.parsers_end.values():
-            if not parser.initialized:
+        for parser in self.parsers_end:
+            if parser is not None and not parser.initialized:
                 parser._initialize_repository()
 
-    @track_depth
     def _parse(
         self,
         handler: ContentHandler,
         starting: POS,
         boundary: POS,
         greedy: bool = False,
-        **kwargs,
+        find_one: bool = True,
+        parent_capture: Capture | None = None,
+        depth: int = -1,
     ) -> tuple[bool, list[Capture | ContentElement], tuple[POS, POS] | None]:
         """The parse method for grammars for which a begin/end pattern is provided."""
+        depth += 1
 
-        begin_span, _, begin_elements = self.match_and_capture(
-            handler,
-            self.exp_begin,
-            starting,
-            boundary=boundary,
-            parsers=self.parsers_begin,
-            greedy=greedy,
-            **kwargs,
-        )
+        # The begin search and capture of match_and_capture, inlined as most begin searches fail
+        matching, begin_span = handler.search(self.exp_begin, starting, boundary, greedy, depth)
+        begin_elements: list[Capture | ContentElement] = []
+        if matching and self.parsers_begin:
+            capture = Capture(
+                handler,
+                self.exp_begin,
+                matching,
+                self.parsers_begin,
+                starting,
+                boundary,
+                key=self.key,
+                depth=depth,
+            )
+            if parent_capture is not None and capture == parent_capture:
+                begin_span = None
+            else:
+                begin_elements.append(capture)
 
         if not begin_span:
             LOGGER.debug(
                 f"{self.__class__.__name__} no begin match",
                 self,
                 starting,
-                kwargs.get("depth", 0),
+                depth,
             )
             return False, [], None
         LOGGER.info(
             f"{self.__class__.__name__} found begin",
             self,
             starting,
-            kwargs.get("depth", 0),
+            depth,
         )
 
         # Get initial and boundary positions
         current = begin_span[1]
         if boundary is None:
-            boundary = (len(handler.lines) - 1, handler.line_lengths[-1])
+            boundary = handler.eof
 
         # Define loop parameters
         end_elements: list[Capture | ContentElement] = []
         mid_elements: list[Capture | ContentElement] = []
-        patterns = [parser for parser in self.patterns if not parser.disabled]
+        patterns = self._active_patterns
+        patterns_by_char = self._active_patterns_by_char
         first_run = True
 
         while current <= boundary:
@@ -594,19 +737,30 @@ class BeginEndParser(ParserHasPatterns):
             # be applied last, otherwise the same span will be recognzed as the end pattern by the upper level parser
             apply_end_pattern_last = False
 
-            # Try to find patterns first with no leading whitespace charaters allowed
-            for parser in patterns:
+            # Try to find patterns first with no leading whitespace charaters allowed. Without find_one, included
+            # pattern parsers may skip leading characters, such that the patterns can not be selected by character.
+            if find_one:
+                candidates = _candidate_patterns(handler, current, patterns, patterns_by_char)
+            else:
+                candidates = patterns
+            for parser in candidates:
                 parsed, capture_elements, capture_span = parser._parse(
-                    handler, current, boundary=boundary, greedy=False, **kwargs
+                    handler,
+                    current,
+                    boundary=boundary,
+                    greedy=False,
+                    find_one=find_one,
+                    parent_capture=parent_capture,
+                    depth=depth,
                 )
                 if parsed:
-                    if parser == self:
+                    if parser is self:
                         apply_end_pattern_last = True
                     LOGGER.debug(
                         f"{self.__class__.__name__} found pattern (no ws)",
                         self,
                         current,
-                        kwargs.get("depth", 0),
+                        depth,
                     )
                     break
 
@@ -618,7 +772,8 @@ class BeginEndParser(ParserHasPatterns):
                 boundary=boundary,
                 parsers=self.parsers_end,
                 greedy=False,
-                **kwargs,
+                parent_capture=parent_capture,
+                depth=depth,
             )
 
             if not parsed and not end_span:
@@ -628,65 +783,69 @@ class BeginEndParser(ParserHasPatterns):
                     f"{self.__class__.__name__} getting all pattern options",
                     self,
                     current,
-                    kwargs.get("depth", 0),
+                    depth,
                 )
 
-                options_span, options_elements = {}, {}
+                options_start: list[POS] = []
+                options_span: list[tuple[POS, POS]] = []
+                options_parser: list[GrammarParser] = []
+                options_elements: list[list[Capture | ContentElement]] = []
                 for parser in patterns:
                     parsed, capture_elements, capture_span = parser._parse(
                         handler,
                         current,
                         boundary=boundary,
                         greedy=True,
-                        **kwargs,
+                        find_one=find_one,
+                        parent_capture=parent_capture,
+                        depth=depth,
                     )
                     if parsed:
-                        options_span[parser] = capture_span
-                        options_elements[parser] = capture_elements
+                        options_start.append(capture_span[0])
+                        options_span.append(capture_span)
+                        options_parser.append(parser)
+                        options_elements.append(capture_elements)
                         LOGGER.debug(
                             f"{self.__class__.__name__} found pattern choice",
                             self,
                             current,
-                            kwargs.get("depth", 0),
+                            depth,
                         )
 
-                if options_span:
+                if options_start:
                     parsed = True
-                    parser = sorted(
-                        options_span,
-                        key=lambda parser: (
-                            *options_span[parser][0],
-                            patterns.index(parser),
-                        ),
-                    )[0]
-                    capture_span = options_span[parser]
-                    capture_elements = options_elements[parser]
-
-                    if parser == self:
+                    # The first option with the earliest start, as the options are in order of the patterns
+                    index = options_start.index(min(options_start))
+                    parser = options_parser[index]
+                    capture_span = options_span[index]
+                    capture_elements = options_elements[index]
+
+                    if parser is self:
                         apply_end_pattern_last = True
 
                     LOGGER.info(
                         f"{self.__class__.__name__} chosen pattern of {parser}",
                         self,
                         current,
-                        kwargs.get("depth", 0),
+                        depth,
                     )
 
-                end_span, end_content, end_elements = self.match_and_capture(
+                end_span, _, end_elements = self.match_and_capture(
                     handler,
                     self.exp_end,
                     current,
                     boundary=boundary,
                     parsers=self.parsers_end,
                     greedy=True,
-                    **kwargs,
+                    parent_capture=parent_capture,
+                    depth=depth,
                 )
 
             if end_span:
                 if parsed:
                     # Check whether the capture pattern has the same closing positions as the end pattern
                     capture_before_end = handler.prev(capture_span[1])
-                    if handler.read(capture_before_end, skip_newline=False) == "\n":
+                    if handler.is_newline(capture_before_end):
                         # If capture pattern ends with \n, both left and right of \n is considered end
                         pattern_at_end = end_span[1] in [
                             capture_before_end,
@@ -705,7 +864,7 @@ class BeginEndParser(ParserHasPatterns):
                                 f"{self.__class__.__name__} capture+end: both accepted, break",
                                 self,
                                 current,
-                                kwargs.get("depth", 0),
+                                depth,
                             )
                             mid_elements.extend(capture_elements)
                             closing = end_span[0] if self.between_content else end_span[1]
@@ -716,7 +875,7 @@ class BeginEndParser(ParserHasPatterns):
                                 f"{self.__class__.__name__} capture+end: end prioritized, break",
                                 self,
                                 current,
-                                kwargs.get("depth", 0),
+                                depth,
                             )
                             closing = end_span[0] if self.between_content else end_span[1]
                             break
@@ -726,7 +885,7 @@ class BeginEndParser(ParserHasPatterns):
                                 f"{self.__class__.__name__} capture+end: capture prioritized, continue",
                                 self,
                                 current,
-                                kwargs.get("depth", 0),
+                                depth,
                             )
                             mid_elements.extend(capture_elements)
                             current = capture_span[1]
@@ -737,7 +896,7 @@ class BeginEndParser(ParserHasPatterns):
                             f"{self.__class__.__name__} capture<end: leading capture, continue",
                             self,
                             current,
-                            kwargs.get("depth", 0),
+                            depth,
                         )
                         mid_elements.extend(capture_elements)
                         current = capture_span[1]
@@ -747,7 +906,7 @@ class BeginEndParser(ParserHasPatterns):
                             f"{self.__class__.__name__} end<capture: leading end, break",
                             self,
                             current,
-                            kwargs.get("depth", 0),
+                            depth,
                         )
                         closing = end_span[0] if self.between_content else end_span[1]
                         break
@@ -757,7 +916,7 @@ class BeginEndParser(ParserHasPatterns):
                         f"{self.__class__.__name__} end: break",
                         self,
                         current,
-                        kwargs.get("depth", 0),
+                        depth,
                     )
                     closing = end_span[0] if self.between_content else end_span[1]
                     break
@@ -766,14 +925,14 @@ class BeginEndParser(ParserHasPatterns):
                     # Append found capture pattern and find next starting position
                     mid_elements.extend(capture_elements)
 
-                    if handler.read(capture_span[1], skip_newline=False) == "\n":
+                    if handler.is_newline(capture_span[1]):
                         # Next character after capture pattern is newline
 
                         LOGGER.debug(
                             f"{self.__class__.__name__} capture: next is newline, continue",
                             self,
                             current,
-                            kwargs.get("depth", 0),
+                            depth,
                         )
 
                         end_span, _, _ = self.match_and_capture(
@@ -782,8 +941,8 @@ class BeginEndParser(ParserHasPatterns):
                             capture_span[1],
                             boundary=boundary,
                             parsers=self.parsers_end,
-                            allow_leading_all=False,
-                            **kwargs,
+                            parent_capture=parent_capture,
+                            depth=depth,
                         )
 
                         if end_span and end_span[1] <= handler.next(capture_span[1]):
@@ -797,7 +956,7 @@ class BeginEndParser(ParserHasPatterns):
                             f"{self.__class__.__name__} capture: continue",
                             self,
                             current,
-                            kwargs.get("depth", 0),
+                            depth,
                         )
                         current = capture_span[1]
                 else:
@@ -809,7 +968,7 @@ class BeginEndParser(ParserHasPatterns):
                             f"No patterns found in line, skipping < {repr(line)} >",
                             self,
                             current,
-                            kwargs.get("depth", 0),
+                            depth,
                         )
                     current = handler.next((current[0], handler.line_lengths[current[0]]))
 
@@ -818,7 +977,8 @@ class BeginEndParser(ParserHasPatterns):
 
             if first_run:
                 # Skip all parsers that were anchored to the begin pattern after the first round
-                patterns = [parser for parser in patterns if not parser.anchored]
+                patterns = self._non_anchored_patterns
+                patterns_by_char = self._non_anchored_patterns_by_char
                 first_run = False
         else:
             # Did not break out of while loop, set closing to boundary
@@ -832,7 +992,7 @@ class BeginEndParser(ParserHasPatterns):
             f"{self.__class__.__name__} found < {repr(content)} >",
             self,
             start,
-            kwargs.get("depth", 0),
+            depth,
         )
 
         # Construct output elements
@@ -860,13 +1020,13 @@ class BeginWhileParser(PatternsParser):
     def __init__(self, grammar: dict, **kwargs) -> None:
         super().__init__(grammar, **kwargs)
         if "contentName" in grammar:
-            self.token = grammar["contentName"]
+            self.token = sys.intern(grammar["contentName"])
             self.between_content = True
         else:
-            self.token = grammar.get("name")
+            self.token = sys.intern(grammar.get("name", ""))
             self.between_content = False
-        self.exp_begin = re.compile(grammar["begin"])
-        self.exp_while = re.compile(grammar["while"])
+        self.exp_begin = _compile(grammar["begin"])
+        self.exp_while = _compile(grammar["while"])
         self.parsers_begin = self._init_captures(grammar, key="beginCaptures")
         self.parsers_while = self._init_captures(grammar, key="whileCaptures")
 
@@ -881,24 +1041,32 @@ class BeginWhileParser(PatternsParser):
         """When the grammar has patterns, this method should called to initialize its inclusions."""
         self.initialized = True
         super()._initialize_repository()
-        for key, value in self.parsers_end.items():
-            if not isinstance(value, GrammarParser):
+        for key, value in enumerate(self.parsers_end):
+            if value is not None and not isinstance(value, GrammarParser):
                 self.parsers_end[key] = self._find_include(value)
-        for key, value in self.parsers_while.items():
-            if not isinstance(value, GrammarParser):
+        for key, value in enumerate(self.parsers_while):
+            if value is not None and not isinstance(value, GrammarParser):
                 self.parsers_while[key] = self._find_include(value)
-        for parser in self.parsers_begin.values():
-            if not parser.initialized:
+        for parser in self.parsers_begin:
+            if parser is not None and not parser.initialized:
                 parser._initialize_repository()
-        for parser in self.parsers_while.values():
-            if not parser.initialized:
+        for parser in self.parsers_while:
+            if parser is not None and not parser.initialized:
                 parser._initialize_repository()
 
+    def first_set(self) -> frozenset[str] | None:
+        """The begin/while parse is not implemented, such that its first characters are unknown."""
+        return None
+
     def _parse(
         self,
         handler: ContentHandler,
         starting: POS,
-        **kwargs,
+        boundary: POS | None = None,
+        greedy: bool = False,
+        find_one: bool = True,
+        parent_capture: Capture | None = None,
+        depth: int = -1,
     ):
         """The parse method for grammars for which a begin/while pattern is provided."""
         raise NotImplementedError
@@ -1,3 +1,6 @@
+from bisect import bisect_right
+from functools import lru_cache
+from itertools import accumulate
 from pathlib import Path
 
 from onigurumacffi import _Match as Match
@@ -31,12 +34,22 @@ class ContentHandler:
         :ivar source: The source code to be processed.
         :ivar lines: A list of lines in the source code, with a newline character at the end of each line.
         :ivar line_lengths: A list of lengths of each line in the source code.
+        :ivar line_offsets: A list of offsets of the start of each line in the buffer.
+        :ivar buffer: The concatenated lines as a single flat string.
+        :ivar eof: The position of the end of the source code.
+        :ivar filled_lines: A list of line numbers of lines that contain more than a newline character.
         :ivar anchor: The current position in the source code.
+        :ivar search_cache: The leftmost matches of previous searches, keyed by pattern and search start.
         """
         self.source = source
         self.lines = [line + "\n" for line in source.split("\n")]
         self.line_lengths = [len(line) for line in self.lines]
+        self.line_offsets = list(accumulate(self.line_lengths, initial=0))
+        self.buffer = "".join(self.lines)
+        self.eof: POS = (len(self.lines) - 1, self.line_lengths[-1])
+        self.filled_lines = [ln for ln, length in enumerate(self.line_lengths) if length > 1]
         self.anchor: int = 0
+        self.search_cache: dict[tuple[Pattern, int, int, int | None], Match | None] = {}
 
     @classmethod
     def from_path(cls, file_path: Path):
@@ -53,6 +66,25 @@ class ContentHandler:
 
         return cls(content)
 
+    @classmethod
+    @lru_cache(maxsize=None)
+    def _pattern_flags(cls, source: str) -> tuple[bool, bool, bool]:
+        """Returns the properties of a pattern source that determine how it is searched.
+
+        :param source: The source of the regex pattern.
+        :return: Whether the pattern only matches the end of the stream, whether it is anchored to the
+            end of the previous match with \\G, and whether it matches the end of line outside a lookahead.
+        """
+        return (
+            source in ["\\z", "\\Z"],
+            "\\G" in source,
+            bool(cls.notLookForwardEOL.search(source)),
+        )
+
+    def _offset(self, pos: POS) -> int:
+        """Returns the offset of a position in the flat buffer."""
+        return self.line_offsets[pos[0]] + pos[1]
+
     def _check_pos(self, pos: POS):
         if pos[0] > len(self.lines) or pos[1] > self.line_lengths[pos[0]]:
             raise ImpossibleSpan
@@ -64,15 +96,15 @@ class ContentHandler:
         :param step: The number of steps to move forward. Defaults to 1.
         :return: The next position as a tuple (line, column).
         """
-        if step > 1:
-            pos = self.next(pos, step=step - 1)
-        if pos[1] == self.line_lengths[pos[0]]:
-            if pos[0] == len(self.lines):
-                return pos
+        line_number, line_pos = pos
+        for _ in range(max(step, 1)):
+            if line_pos == self.line_lengths[line_number]:
+                if line_number == len(self.lines):
+                    break
+                line_number, line_pos = line_number + 1, 0
             else:
-                return (pos[0] + 1, 0)
-        else:
-            return (pos[0], pos[1] + 1)
+                line_pos += 1
+        return (line_number, line_pos)
 
     def prev(self, pos: POS, step: int = 1) -> POS:
         """Returns the previous position on the current handler.
@@ -81,15 +113,27 @@ class ContentHandler:
         :param step: The number of steps to go back. Defaults to 1.
         :return: The previous position as a tuple (line, column).
         """
-        if step > 1:
-            pos = self.prev(pos, step=step - 1)
-        if pos[1] == 0:
-            if pos[0] == 0:
-                return (0, 0)
+        line_number, line_pos = pos
+        for _ in range(max(step, 1)):
+            if line_pos == 0:
+                if line_number == 0:
+                    break
+                line_number -= 1
+                line_pos = self.line_lengths[line_number]
             else:
-                return (pos[0] - 1, self.line_lengths[pos[0] - 1])
-        else:
-            return (pos[0], pos[1] - 1)
+                line_pos -= 1
+        return (line_number, line_pos)
+
+    def next_filled_line(self, line_number: int) -> int | None:
+        """Returns the number of the first non-empty line after the given line.
+
+        :param line_number: The line number to search from.
+        :return: The line number of the next non-empty line, or None if there is no such line.
+        """
+        index = bisect_right(self.filled_lines, line_number)
+        if index == len(self.filled_lines):
+            return None
+        return self.filled_lines[index]
 
     def range(self, start: POS, close: POS) -> list[POS]:
         """
@@ -99,18 +143,14 @@ class ContentHandler:
         :param close: The closing position.
         :return: A list of positions between the start and close positions.
         """
-        indices = []
         if start[0] == close[0]:
-            for lp in range(start[1], close[1]):
-                indices.append((start[0], lp))
-        else:
-            for lp in range(start[1], self.line_lengths[start[0]]):
-                indices.append((start[0], lp))
-            for ln in range(start[0] + 1, close[0]):
-                for lp in range(self.line_lengths[ln]):
-                    indices.append((ln, lp))
-            for lp in range(close[1]):
-                indices.append((close[0], lp))
+            line_number = start[0]
+            return [(line_number, lp) for lp in range(start[1], close[1])]
+
+        indices = [(start[0], lp) for lp in range(start[1], self.line_lengths[start[0]])]
+        for ln in range(start[0] + 1, close[0]):
+            indices.extend([(ln, lp) for lp in range(self.line_lengths[ln])])
+        indices.extend([(close[0], lp) for lp in range(close[1])])
         return indices
 
     def chars(self, start: POS, close: POS) -> dict[POS, str]:
@@ -121,8 +161,19 @@ class ContentHandler:
         :param close: The closing position of the range.
         :return: A dictionary mapping each position within the range to the corresponding source character.
         """
+        if start[0] == close[0]:
+            # Single line spans are read directly from the line, without listing the positions first
+            line_number = start[0]
+            readout = self.lines[line_number][start[1] : close[1]]
+            return {
+                (line_number, lp): char if char != "\n" else ""
+                for lp, char in enumerate(readout, start[1])
+            }
+
         indices = self.range(start, close)
-        return {pos: self.read(pos) for pos in indices}
+        offset = self._offset(start)
+        readout = self.buffer[offset : offset + len(indices)]
+        return {pos: char if char != "\n" else "" for pos, char in zip(indices, readout)}
 
     def read_pos(self, start_pos: POS, close_pos: POS, skip_newline: bool = True) -> str:
         """Reads the content between the start and end positions.
@@ -141,14 +192,7 @@ class ContentHandler:
         if start_pos[0] == close_pos[0]:
             readout = self.lines[start_pos[0]][start_pos[1] : close_pos[1]]
         else:
-            readout = ""
-            for ln in range(start_pos[0], close_pos[0] + 1):
-                if ln == start_pos[0]:
-                    readout += self.lines[ln][start_pos[1] :]
-                elif ln == close_pos[0]:
-                    readout += self.lines[ln][: close_pos[1]]
-                else:
-                    readout += self.lines[ln]
+            readout = self.buffer[self._offset(start_pos) : self._offset(close_pos)]
 
         if skip_newline and readout and readout[-1] == "\n":
             readout = readout[:-1]
@@ -166,6 +210,17 @@ class ContentHandler:
         line = self.lines[pos[0]]
         return line[pos[1] :]
 
+    def is_newline(self, pos: POS) -> bool:
+        """Returns whether the character at a position is a newline character.
+
+        Equivalent to ``read(pos, skip_newline=False) == "\\n"``, looked up directly in the flat buffer.
+
+        :param pos: The position of the character.
+        :return: True if the character at the position is a newline character.
+        """
+        offset = self._offset(pos)
+        return offset < len(self.buffer) and self.buffer[offset] == "\n"
+
     def read(self, start_pos: POS, length: int = 1, skip_newline: bool = True) -> str:
         """Reads the content from start for a length.
 
@@ -183,19 +238,11 @@ class ContentHandler:
 
         if length <= remainder:
             readout = self.lines[start_pos[0]][start_pos[1] : (start_pos[1] + length)]
+        elif start_pos[0] + 1 >= len(self.lines):
+            return ""
         else:
-            readout = self.lines[start_pos[0]][start_pos[1] :]
-            unread_length = length - remainder
-            ln = start_pos[0] + 1
-            if ln >= len(self.lines):
-                return ""
-
-            while unread_length > self.line_lengths[ln]:
-                readout += self.lines[ln]
-                unread_length -= self.line_lengths[ln]
-                ln += 1
-            else:
-                readout += self.lines[ln][:unread_length]
+            offset = self._offset(start_pos)
+            readout = self.buffer[offset : offset + length]
 
         if skip_newline and readout[-1] == "\n":
             readout = readout[:-1]
@@ -208,7 +255,7 @@ class ContentHandler:
         starting: POS,
         boundary: POS | None = None,
         greedy: bool = False,
-        **kwargs,
+        depth: int = 0,
     ) -> tuple[Match | None, tuple[POS, POS] | None]:
         """Matches the stream against a capture group.
 
@@ -216,7 +263,7 @@ class ContentHandler:
         :param starting: The starting position in the stream.
         :param boundary: The boundary position in the stream. Defaults to None.
         :param greedy: Determines if the matching should be greedy or not. Defaults to False.
-        :param kwargs: Additional keyword arguments.
+        :param depth: The depth of the calling parser, used for logging. Defaults to 0.
 
         :return: A tuple containing the matching result and the span of the match.
 
@@ -236,20 +283,37 @@ class ContentHandler:
                 - `2`: any character allowed.
         """
 
-        if pattern._pattern in ["\\z", "\\Z"]:
+        to_end, anchored, matches_eol = self._pattern_flags(pattern._pattern)
+        if to_end:
             greedy = True
 
         # Get line from starting (and boundary) positions
         if boundary and starting[0] == boundary[0]:
             line = self.lines[starting[0]][: boundary[1]]
+            line_end = boundary[1]
         else:
             line = self.lines[starting[0]]
+            line_end = None
 
         # Gets the previous matching end position from anchor in case of \G.
-        init_pos = self.anchor if "\\G" in pattern._pattern else starting[1]
-
-        # Find begin of line and search starting from the initial position
-        matching = pattern.search(line, start=init_pos)
+        init_pos = self.anchor if anchored else starting[1]
+
+        # Find begin of line and search starting from the initial position. The leftmost match is
+        # independent of the search options, such that it is reused by any subsequent search of the
+        # same pattern on the same line from the same position.
+        key = (pattern, starting[0], init_pos, line_end)
+        if key in self.search_cache:
+            matching = self.search_cache[key]
+        elif not greedy and init_pos < len(line) and not line[init_pos].isspace():
+            # If only whitespace may be skipped and the initial character is not whitespace, the match
+            # can only start at the initial position, such that a single anchored match replaces
+            # scanning the remainder of the line. A found match is then also the leftmost match.
+            matching = pattern.match(line, start=init_pos)
+            if matching:
+                self.search_cache[key] = matching
+        else:
+            matching = pattern.search(line, start=init_pos)
+            self.search_cache[key] = matching
 
         # Check that no charaters are skipped in case ws-only is enabled
         if matching:
@@ -271,15 +335,16 @@ class ContentHandler:
             LOGGER.warning(
                 f"skipping < {leading_string} >",
                 position=start_pos,
-                depth=kwargs.get("depth", 0),
+                depth=depth,
             )
 
         # Include \n in match span if pattern matches on end of line $
-        if (
-            self.notLookForwardEOL.search(pattern._pattern)
-            and matching.end() + 1 == self.line_lengths[starting[0]]
-        ):
-            newline_matching = pattern.search(line[:-1])
+        if matches_eol and matching.end() + 1 == self.line_lengths[starting[0]]:
+            # Reuses the cache, as the same line is rescanned for every match ending on this line
+            newline_key = (pattern, starting[0], 0, len(line) - 1)
+            if newline_key not in self.search_cache:
+                self.search_cache[newline_key] = pattern.search(line[:-1])
+            newline_matching = self.search_cache[newline_key]
             if newline_matching and newline_matching.span() == matching.span():
                 close_pos = (starting[0], matching.end() + 1)
 
@@ -1,5 +1,4 @@
 import logging
-from functools import wraps
 from typing import TYPE_CHECKING, Optional
 
 if TYPE_CHECKING:
@@ -9,16 +8,6 @@ if TYPE_CHECKING:
 MAX_LENGTH = 79
 
 
-def track_depth(func):
-    """Simple decorator to track recusion depth."""
-
-    @wraps(func)
-    def wrapper(*args, depth: int = -1, **kwargs):
-        return func(*args, depth=depth + 1, **kwargs)
-
-    return wrapper
-
-
 class LogFormatter(logging.Formatter):
     """
     A custom log formatter that formats log records with color-coded messages.
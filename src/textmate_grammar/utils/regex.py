@@ -0,0 +1,257 @@
+import string
+
+ASCII = frozenset(map(chr, range(128)))
+WORD = frozenset(string.ascii_letters + string.digits + "_")
+DIGIT = frozenset(string.digits)
+HEX = frozenset(string.hexdigits)
+SPACE = frozenset(string.whitespace)
+
+CLASS_ESCAPES = {
+    "w": WORD,
+    "W": ASCII - WORD,
+    "d": DIGIT,
+    "D": ASCII - DIGIT,
+    "h": HEX,
+    "H": ASCII - HEX,
+    "s": SPACE,
+    "S": ASCII - SPACE,
+}
+POSIX_CLASSES = {
+    "alpha": frozenset(string.ascii_letters),
+    "upper": frozenset(string.ascii_uppercase),
+    "lower": frozenset(string.ascii_lowercase),
+    "digit": DIGIT,
+    "alnum": frozenset(string.ascii_letters + string.digits),
+    "xdigit": HEX,
+    "word": WORD,
+    "punct": frozenset(string.punctuation),
+    "space": SPACE,
+    "blank": frozenset(" \t"),
+}
+CONTROL_ESCAPES = {"t": "\t", "n": "\n", "r": "\r", "f": "\f", "v": "\v", "a": "\a", "e": "\x1b"}
+ZERO_WIDTH_ESCAPES = "AzZbB"
+LOOKAROUNDS = ("(?=", "(?!", "(?<=", "(?<!")
+
+
+class _UnknownFirstChars(Exception):
+    """Raised when the first characters of a pattern can not be determined."""
+
+
+class _FirstCharsScanner:
+    """Scans a pattern source for the ASCII characters a match of the pattern can start with."""
+
+    def __init__(self, source: str) -> None:
+        self.source = source
+        self.index = 0
+
+    def _peek(self, length: int = 1) -> str:
+        return self.source[self.index : self.index + length]
+
+    def alternation(self) -> tuple[frozenset[str], bool]:
+        """Scans alternatives up to the end of the current group.
+
+        :return: The first characters of the alternatives and whether any alternative can match empty.
+        """
+        chars, nullable = self.sequence()
+        while self._peek() == "|":
+            self.index += 1
+            branch_chars, branch_nullable = self.sequence()
+            chars |= branch_chars
+            nullable = nullable or branch_nullable
+        return chars, nullable
+
+    def sequence(self) -> tuple[frozenset[str], bool]:
+        """Scans a sequence of atoms up to the next alternative or the end of the current group.
+
+        :return: The first characters of the sequence and whether the sequence can match empty.
+        """
+        chars: frozenset[str] = frozenset()
+        nullable = True
+        while self.index < len(self.source) and self._peek() not in "|)":
+            atom_chars, atom_nullable = self.atom()
+            atom_nullable = self.quantifier() or atom_nullable
+            if nullable:
+                chars |= atom_chars
+                nullable = atom_nullable
+        return chars, nullable
+
+    def quantifier(self) -> bool:
+        """Scans the quantifier following an atom, if any.
+
+        :return: Whether the quantifier allows zero repetitions.
+        """
+        optional = False
+        char = self._peek()
+        if not char:
+            return False
+        elif char in "*?":
+            self.index += 1
+            optional = True
+        elif char == "+":
+            self.index += 1
+        elif char == "{":
+            close = self.source.find("}", self.index)
+            bounds = self.source[self.index + 1 : close].split(",")
+            if close == -1 or len(bounds) > 2 or not all(b.isdigit() or not b for b in bounds):
+                # Not a quantifier, such that the brace is a literal character
+                return False
+            if not any(bounds):
+                return False
+            self.index = close + 1
+            optional = not bounds[0] or int(bounds[0]) == 0
+        else:
+            return False
+
+        # Lazy and possessive modifiers
+        if self._peek() in ("?", "+"):
+            self.index += 1
+        return optional
+
+    def atom(self) -> tuple[frozenset[str], bool]:
+        """Scans a single atom.
+
+        :return: The first characters of the atom and whether the atom can match empty.
+        """
+        char = self._peek()
+        if char == "(":
+            return self.group()
+        elif char == "[":
+            return self.bracket(), False
+        elif char == "\\":
+            return self.escape()
+        elif char in "^$":
+            self.index += 1
+            return frozenset(), True
+        elif char == ".":
+            self.index += 1
+            return ASCII - {"\n"}, False
+        elif char in "*+?":
+            raise _UnknownFirstChars
+        self.index += 1
+        return frozenset(char), False
+
+    def group(self) -> tuple[frozenset[str], bool]:
+        """Scans a group, including the closing parenthesis."""
+        if self.source.startswith(LOOKAROUNDS, self.index):
+            # Lookarounds do not consume characters and only restrict the match further
+            self.index += 4 if self.source.startswith(("(?<=", "(?<!"), self.index) else 3
+            self.alternation()
+            self._close_group()
+            return frozenset(), True
+        elif self._peek(3) == "(?#":
+            self.index = self.source.index(")", self.index) + 1
+            return frozenset(), True
+        elif self._peek(3) in ("(?:", "(?>"):
+            self.index += 3
+        elif self._peek(3) == "(?<" or self._peek(3) == "(?'":
+            closing = ">" if self._peek(3) == "(?<" else "'"
+            self.index = self.source.index(closing, self.index + 3) + 1
+        elif self._peek(2) == "(?":
+            # Option settings, absent groups, conditionals and other extensions
+            raise _UnknownFirstChars
+        else:
+            self.index += 1
+        chars, nullable = self.alternation()
+        self._close_group()
+        return chars, nullable
+
+    def _close_group(self) -> None:
+        if self._peek() != ")":
+            raise _UnknownFirstChars
+        self.index += 1
+
+    def escape(self) -> tuple[frozenset[str], bool]:
+        """Scans an escape sequence outside of a bracket expression."""
+        char = self._peek(2)[1:]
+        self.index += 2
+        if not char:
+            raise _UnknownFirstChars
+        elif char in ZERO_WIDTH_ESCAPES:
+            return frozenset(), True
+        elif char in CLASS_ESCAPES:
+            return CLASS_ESCAPES[char], False
+        elif char in CONTROL_ESCAPES:
+            return frozenset(CONTROL_ESCAPES[char]), False
+        elif not char.isalnum():
+            return frozenset(char), False
+        # Back-references, \G, \K, \p{...}, code points and other escapes
+        raise _UnknownFirstChars
+
+    def bracket(self) -> frozenset[str]:
+        """Scans a bracket expression, including the closing bracket."""
+        self.index += 1
+        negated = self._peek() == "^"
+        if negated:
+            self.index += 1
+
+        chars: set[str] = set()
+        first = True
+        while True:
+            char = self._peek()
+            if not char or self._peek(2) in ("[^", "&&") or (char == "[" and self._peek(2) != "[:"):
+                # Nested or intersected bracket expressions
+                raise _UnknownFirstChars
+            if char == "]" and not first:
+                self.index += 1
+                break
+            first = False
+
+            if self._peek(2) == "[:":
+                close = self.source.find(":]", self.index)
+                name = self.source[self.index + 2 : close]
+                if close == -1 or name not in POSIX_CLASSES:
+                    raise _UnknownFirstChars
+                chars |= POSIX_CLASSES[name]
+                self.index = close + 2
+                continue
+
+            start = self._bracket_char()
+            if isinstance(start, frozenset):
+                chars |= start
+            elif self._peek() == "-" and self._peek(2) != "-]":
+                self.index += 1
+                end = self._bracket_char()
+                if isinstance(end, frozenset) or end < start:
+                    raise _UnknownFirstChars
+                chars |= {chr(code) for code in range(ord(start), min(ord(end), 127) + 1)}
+            else:
+                chars.add(start)
+
+        if negated:
+            return ASCII - chars
+        return frozenset(chars)
+
+    def _bracket_char(self) -> str | frozenset[str]:
+        """Scans a single character or class escape within a bracket expression."""
+        char = self._peek()
+        self.index += 1
+        if char != "\\":
+            return char
+        char = self._peek()
+        self.index += 1
+        if char in CLASS_ESCAPES:
+            return CLASS_ESCAPES[char]
+        elif char in CONTROL_ESCAPES:
+            return CONTROL_ESCAPES[char]
+        elif char and not char.isalnum():
+            return char
+        raise _UnknownFirstChars
+
+
+def pattern_first_chars(source: str) -> frozenset[str] | None:
+    """Determines the ASCII characters that a match of a pattern can start with.
+
+    The analysis is conservative: for an ASCII character outside the returned set, the pattern cannot match
+    at a position starting with that character. Characters outside of the ASCII range are not covered.
+
+    :param source: The source of the oniguruma pattern.
+    :return: The set of ASCII characters, or None if they cannot be determined or the pattern can match empty.
+    """
+    scanner = _FirstCharsScanner(source)
+    try:
+        chars, nullable = scanner.alternation()
+    except (_UnknownFirstChars, ValueError):
+        return None
+    if nullable or scanner.index != len(source):
+        return None
+    return chars & ASCII
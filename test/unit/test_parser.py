@@ -0,0 +1,119 @@
+import pytest
+
+from textmate_grammar.language import LanguageParser
+from textmate_grammar.utils.handler import ContentHandler
+
+GRAMMAR = {
+    "scopeName": "source.firstset",
+    "patterns": [{"include": "#block"}],
+    "repository": {
+        "block": {
+            "begin": "<",
+            "end": ">",
+            "name": "block.firstset",
+            "patterns": [{"match": "b", "name": "b.firstset"}],
+        },
+        "group": {
+            "patterns": [
+                {"match": "a+", "name": "a.firstset"},
+                {"match": "b|c", "name": "bc.firstset"},
+            ]
+        },
+        "unknown": {
+            "patterns": [
+                {"match": "a", "name": "a.firstset"},
+                {"match": "b?", "name": "b.firstset"},
+            ]
+        },
+        "recursive": {
+            "patterns": [
+                {"include": "#recursive"},
+                {"match": "a", "name": "a.firstset"},
+            ]
+        },
+        "tokened": {
+            "name": "group.firstset",
+            "patterns": [{"match": "a", "name": "a.firstset"}],
+        },
+    },
+}
+
+parser = LanguageParser(GRAMMAR)
+
+
+def _repository_parser(key):
+    repository_parser = parser.repository[key]
+    if not repository_parser.initialized:
+        repository_parser._initialize_repository()
+    return repository_parser
+
+
+def test_first_set_union():
+    """Test that a pattern parser without token starts with the first characters of its patterns"""
+    assert _repository_parser("group").first_set() == frozenset("abc")
+
+
+@pytest.mark.parametrize("key", ["unknown", "recursive", "tokened"])
+def test_first_set_unknown(key):
+    """Test that the first characters are unknown for unknown patterns, self inclusions and tokens"""
+    assert _repository_parser(key).first_set() is None
+
+
+@pytest.mark.parametrize("find_one", [True, False])
+def test_begin_end_candidates(monkeypatch, find_one):
+    """Test that a begin/end parser only selects its patterns by first character with find_one"""
+    block = _repository_parser("block")
+    pattern = block._active_patterns[0]
+    searches = []
+
+    def _parse(handler, starting, *args, **kwargs):
+        searches.append((starting, kwargs.get("greedy")))
+        return original_parse(handler, starting, *args, **kwargs)
+
+    original_parse = pattern._parse
+    monkeypatch.setattr(pattern, "_parse", _parse)
+
+    handler = ContentHandler("<xb>")
+    parsed, _, _ = block._parse(handler, (0, 0), handler.eof, find_one=find_one)
+
+    assert parsed
+    # The character x after the begin pattern is not a first character of the pattern b
+    assert (((0, 1), False) in searches) is not find_one
+
+
+def test_empty_match_moves_anchor():
+    """Test that a round with only an empty match continues when it moved the \\G anchor"""
+    anchor_parser = LanguageParser(
+        {
+            "scopeName": "source.emptyanchor",
+            "patterns": [
+                {"match": "\\Gb", "name": "anchored.emptyanchor"},
+                {"match": "(?=b)", "name": "empty.emptyanchor"},
+                {"match": "a", "name": "a.emptyanchor"},
+                {"match": "c", "name": "c.emptyanchor"},
+            ],
+        }
+    )
+    element = anchor_parser.parse_string("xabc")
+    assert element
+    assert [(child.token, child.content) for child in element.children] == [
+        ("a.emptyanchor", "a"),
+        ("empty.emptyanchor", ""),
+        ("anchored.emptyanchor", "b"),
+        ("c.emptyanchor", "c"),
+    ]
+
+
+def test_empty_match_stops():
+    """Test that the parse stops when rounds only find empty matches at the same position"""
+    empty_parser = LanguageParser(
+        {
+            "scopeName": "source.emptystall",
+            "patterns": [{"match": "(?=a)", "name": "empty.emptystall"}],
+        }
+    )
+    element = empty_parser.parse_string("ba")
+    assert element
+    assert element.children
+    assert all(child.token == "empty.emptystall" for child in element.children)
+    assert all(child.content == "" for child in element.children)
@@ -0,0 +1,157 @@
+import string
+
+import onigurumacffi
+import pytest
+
+from textmate_grammar.utils.regex import ASCII, pattern_first_chars
+
+
+@pytest.mark.parametrize(
+    "pattern,expected",
+    [
+        ("abc", "a"),
+        ("\\.m", "."),
+        ("\\(", "("),
+        ("\\t", "\t"),
+        ("\\d+", string.digits),
+        ("\\h", string.hexdigits),
+        ("[a-c]x", "abc"),
+        ("[-+]", "-+"),
+        ("[a-]", "a-"),
+        ("[]a]", "]a"),
+        ("[\\d_]", string.digits + "_"),
+        ("[[:upper:]]", string.ascii_uppercase),
+        ("[[:digit:][:blank:]]", string.digits + " \t"),
+        ("(?:foo|bar)", "fb"),
+        ("(?<name>x)y", "x"),
+        ("(?>ab)", "a"),
+        ("a|b|c", "abc"),
+    ],
+)
+def test_first_chars(pattern, expected):
+    """Test the first characters of patterns that consume a character"""
+    assert pattern_first_chars(pattern) == frozenset(expected)
+
+
+@pytest.mark.parametrize(
+    "pattern,expected",
+    [
+        ("[^a]", ASCII - {"a"}),
+        ("[^[:alpha:]]", ASCII - frozenset(string.ascii_letters)),
+        (".", ASCII - {"\n"}),
+        ("\\W", ASCII - frozenset(string.ascii_letters + string.digits + "_")),
+    ],
+)
+def test_negated_first_chars(pattern, expected):
+    """Test the first characters of negated classes"""
+    assert pattern_first_chars(pattern) == expected
+
+
+@pytest.mark.parametrize(
+    "pattern,expected",
+    [
+        ("a?b", "ab"),
+        ("a*b", "ab"),
+        ("a{0}b", "ab"),
+        ("a{,2}b", "ab"),
+        ("a{0,2}?b", "ab"),
+        ("a+b", "a"),
+        ("a{1,2}b", "a"),
+        ("a{2}b", "a"),
+        ("(a|)b", "ab"),
+    ],
+)
+def test_quantifiers(pattern, expected):
+    """Test that atoms which can be repeated zero times include the following atom"""
+    assert pattern_first_chars(pattern) == frozenset(expected)
+
+
+@pytest.mark.parametrize(
+    "pattern,expected",
+    [
+        ("{", "{"),
+        ("{}", "{"),
+        ("x{1, 2}", "x"),
+        ("{a}", "{"),
+    ],
+)
+def test_literal_braces(pattern, expected):
+    """Test that braces which do not form a quantifier are literal characters"""
+    assert pattern_first_chars(pattern) == frozenset(expected)
+
+
+@pytest.mark.parametrize(
+    "pattern,expected",
+    [
+        ("(?=a)b", "b"),
+        ("(?!a)[ab]", "ab"),
+        ("(?<=a)b", "b"),
+        ("(?<!\\w)x", "x"),
+        ("^\\s*%", string.whitespace + "%"),
+        ("\\bend\\b", "e"),
+        ("(?#comment)a", "a"),
+    ],
+)
+def test_zero_width(pattern, expected):
+    """Test that lookarounds, anchors and comments do not consume a character"""
+    assert pattern_first_chars(pattern) == frozenset(expected)
+
+
+@pytest.mark.parametrize(
+    "pattern",
+    [
+        "",
+        "a?",
+        "a*",
+        "(?=a)",
+        "^",
+        "$",
+        "\\b",
+        "a|",
+        "\\G",
+        "\\Ga",
+        "(a)\\1",
+        "\\k<name>",
+        "(?i)a",
+        "(?x) a",
+        "(?i:a)",
+        "\\p{Alpha}",
+        "[a[bc]]",
+        "[a-z&&[^d]]",
+        "a)",
+        "[a",
+        "*a",
+        "[z-a]",
+    ],
+)
+def test_unknown(pattern):
+    """Test that nullable and unsupported patterns have unknown first characters"""
+    assert pattern_first_chars(pattern) is None
+
+
+@pytest.mark.parametrize(
+    "pattern",
+    [
+        "abc",
+        "\\s*%",
+        "[^a-z]+",
+        "(?:\\.\\.\\.|%)",
+        "[[:punct:]]{1,2}",
+        "a{,2}b",
+        "x{1, 2}",
+        "{}",
+        "(?<!\\w)\\d+(?:\\.\\d*)?",
+        "\\v|\\h",
+        "(?!end)\\w+",
+        "[\\]\\-]",
+        ".",
+    ],
+)
+@pytest.mark.parametrize("tail", ["", "a", "b1", "{1, 2}", " ", "\n", "bc"])
+def test_soundness(pattern, tail):
+    """Test that a pattern can not match starting with a character outside its first characters"""
+    first_chars = pattern_first_chars(pattern)
+    assert first_chars is not None
+    compiled = onigurumacffi.compile(pattern)
+    for char in sorted(ASCII - first_chars):
+        assert compiled.match(char + tail) is None, repr(char + tail)